@@ -3,9 +3,13 @@ Audio Client - Runs WITHOUT sudo to capture audio and recognize notes
 Sends control commands to the control server via socket
 """
 
+import logging
+import queue
+import signal
 import socket
-import json
 import sys
+import threading
+import protocol
 from note_recognizer import NoteRecognizer
 
 
@@ -14,7 +18,7 @@ class AudioClient:
         self.host = host
         self.port = port
         self.socket = None
-        self.running = True
+        self._stop = threading.Event()  # Set to wake run() and exit
         
         # Note to action mapping
         self.note_actions = {
@@ -26,6 +30,11 @@ class AudioClient:
             'A': 'place_card',    # Place
         }
         
+        # Actions are handed from the audio thread to a sender thread,
+        # so a slow socket write never stalls audio capture
+        self._q = queue.Queue(maxsize=32)
+        self._sender = threading.Thread(target=self._sender_loop, daemon=True)
+        
         # Initialize note recognizer
         self.note_recognizer = NoteRecognizer(self.on_note_detected)
     
@@ -35,6 +44,8 @@ class AudioClient:
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.connect((self.host, self.port))
+            # Send each opcode immediately instead of waiting to coalesce
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             print(f"✓ Connected to control server at {self.host}:{self.port}\n")
             return True
         except ConnectionRefusedError:
@@ -49,18 +60,29 @@ class AudioClient:
             return
         
         try:
-            command = {'action': action, **kwargs}
-            self.socket.sendall(json.dumps(command).encode('utf-8'))
-        except (BrokenPipeError, ConnectionResetError):
+            self.socket.sendall(bytes((protocol.encode(action, **kwargs),)))
+        except OSError:
+            # Any socket error ends the session rather than the sender thread
             print("✗ Lost connection to control server")
-            self.running = False
+            self._stop.set()
+    
+    def _sender_loop(self):
+        """Send queued actions to the control server until 'exit' is sent"""
+        while True:
+            action = self._q.get()
+            self.send_command(action)
+            if action == 'exit':
+                break
     
     def on_note_detected(self, note):
         """Called when a note is detected from the recorder"""
         if note in self.note_actions:
             action = self.note_actions[note]
             print(f"🎵 Note {note} detected → {action}")
-            self.send_command(action)
+            try:
+                self._q.put_nowait(action)
+            except queue.Full:
+                print(f"⚠️  Command queue full, dropping {action}")
         else:
             print(f"⚠️  Unknown note: {note}")
     
@@ -85,41 +107,50 @@ class AudioClient:
         if not self.connect():
             sys.exit(1)
         
-        # Start note recognition
+        # Start note recognition before any of our threads exist, so the
+        # audio process is forked from a single-threaded process
         print("Starting note recognition...")
         self.note_recognizer.start()
         print("✓ Note recognition started")
+        self._sender.start()
         print("\n🎤 Play your recorder notes!\n")
         print("Press Ctrl+C to exit")
         print("=" * 60)
         print()
         
+        # Ctrl+C just wakes the main thread instead of raising mid-wait
+        signal.signal(signal.SIGINT, lambda *args: self._stop.set())
+        
         try:
-            # Keep the program running
-            while self.running:
-                import time
-                time.sleep(0.1)
-        except KeyboardInterrupt:
-            pass
+            # Park until a signal or a lost connection asks us to stop
+            self._stop.wait()
         finally:
             self.cleanup()
     
     def cleanup(self):
         """Cleanup and exit"""
         print("\n\nExiting...")
+        self._stop.set()
         
         # Stop note recognition
         self.note_recognizer.stop()
         
-        # Close socket
+        # Flush queued commands, then close socket
         if self.socket:
-            self.send_command('exit')
+            try:
+                self._q.put('exit', timeout=1.0)
+            except queue.Full:
+                pass  # Sender is gone or stuck; closing the socket still ends the session
+            self._sender.join(timeout=1.0)
             self.socket.close()
         
         print("Audio client stopped.")
 
 
 if __name__ == "__main__":
+    # "Note played" at INFO; per-chunk "Note detected" lines are DEBUG
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     try:
         client = AudioClient()
         client.run()
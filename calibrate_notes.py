@@ -6,26 +6,43 @@ Use this to find the exact frequencies your recorder produces
 import numpy as np
 import pyaudio
 import time
+from scipy.fft import rfft
 
 SAMPLE_RATE = 44100  # Using same rate as your working code
 CHUNK_SIZE = 1024  # Using same chunk size as your working code
+BIN_HZ = SAMPLE_RATE / CHUNK_SIZE  # Width of one FFT bin (~43 Hz)
+
+# Only frequencies in this range are collected for the printed averages
+MIN_FREQ = 200
+MAX_FREQ = 700
+
+# Reused every frame so the FFT input never has to be reallocated
+_scratch_f32 = np.empty(CHUNK_SIZE, dtype=np.float32)
+_abs_scratch = np.empty(CHUNK_SIZE, dtype=np.int16)
+_power = np.empty(CHUNK_SIZE // 2 + 1, dtype=np.float32)
+_power_imag = np.empty(CHUNK_SIZE // 2 + 1, dtype=np.float32)
+
+# Warm up pocketfft's plan cache so the first real frame isn't slower
+rfft(np.zeros(CHUNK_SIZE, dtype=np.float32))
 
 def get_frequency(audio_data):
     """Analyze audio data and return dominant frequency"""
     audio_array = np.frombuffer(audio_data, dtype=np.int16)
     
-    # Check volume
-    volume = np.abs(audio_array).mean()
+    # Check volume (before any FFT work, so quiet frames stay cheap)
+    volume = np.abs(audio_array, out=_abs_scratch).mean()
     if volume < 100:  # Lowered threshold from 500 to 100
         return None, volume
     
-    # Apply FFT
-    fft = np.fft.rfft(audio_array)
-    fft_magnitude = np.abs(fft)
+    # Apply FFT in float32 (numpy's FFT would upcast to float64)
+    np.copyto(_scratch_f32, audio_array)
+    fft = rfft(_scratch_f32)
     
-    # Find peak frequency
-    peak_index = np.argmax(fft_magnitude)
-    frequency = peak_index * SAMPLE_RATE / len(audio_array)
+    # Find peak frequency (argmax of |X|^2 is the same bin as |X|, no sqrt needed)
+    np.square(fft.real, out=_power)
+    np.add(_power, np.square(fft.imag, out=_power_imag), out=_power)
+    peak_index = np.argmax(_power)
+    frequency = peak_index * BIN_HZ
     
     return frequency, volume
 
@@ -68,7 +85,11 @@ def main():
     print("DEBUG: Listening for audio...")
     print("(If nothing appears, try speaking/tapping the mic to test)\n")
     
-    freq_buffer = []
+    # Running stats for the current print window (no per-frame list/array work)
+    freq_count = 0
+    freq_sum = 0.0
+    min_freq = float('inf')
+    max_freq = 0.0
     last_print_time = 0
     last_debug_time = 0
     
@@ -84,20 +105,26 @@ def main():
                 print(f"DEBUG: Volume level: {volume:5.0f} | Frequency: {frequency if frequency else 'None'}")
                 last_debug_time = current_time
             
-            if frequency and 200 < frequency < 700:
-                freq_buffer.append(frequency)
+            if frequency and MIN_FREQ < frequency < MAX_FREQ:
+                freq_count += 1
+                freq_sum += frequency
+                if frequency < min_freq:
+                    min_freq = frequency
+                if frequency > max_freq:
+                    max_freq = frequency
                 
                 # Print average every 0.5 seconds
-                if current_time - last_print_time > 0.5 and len(freq_buffer) > 0:
-                    avg_freq = np.mean(freq_buffer)
-                    min_freq = np.min(freq_buffer)
-                    max_freq = np.max(freq_buffer)
+                if current_time - last_print_time > 0.5:
+                    avg_freq = freq_sum / freq_count
                     
                     print(f"🎵 Frequency: {avg_freq:6.1f} Hz  "
                           f"(Range: {min_freq:6.1f} - {max_freq:6.1f} Hz)  "
                           f"Volume: {volume:5.0f}")
                     
-                    freq_buffer = []
+                    freq_count = 0
+                    freq_sum = 0.0
+                    min_freq = float('inf')
+                    max_freq = 0.0
                     last_print_time = current_time
     
     except KeyboardInterrupt:
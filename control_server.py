@@ -4,9 +4,11 @@ Listens for commands via local socket
 """
 
 import keyboard
+import logging
+import selectors
 import socket
-import json
 import sys
+import protocol
 from mouse_controller import MouseController
 
 
@@ -25,7 +27,23 @@ class ControlServer:
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.server_socket.bind(('localhost', self.port))
         self.server_socket.listen(1)
-        self.server_socket.settimeout(0.1)  # Non-blocking with timeout
+        self.server_socket.setblocking(False)
+        
+        # Wakeup pair so on_exit() (keyboard thread) can interrupt select()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        
+        # Block until the listening socket, client or wakeup pair is readable
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server_socket, selectors.EVENT_READ, data='accept')
+        self.selector.register(self._wakeup_recv, selectors.EVENT_READ, data='wakeup')
+        
+        # Opcode byte -> handler, so each command is a single list index
+        self._dispatch = self._build_dispatch()
+        
+        # Receive buffer reused for every read from the client
+        self._rxbuf = bytearray(4096)
+        self._rxview = memoryview(self._rxbuf)
         
     def cycle_card_select(self):
         """Cycle through cards 1-4"""
@@ -39,38 +57,42 @@ class ControlServer:
         print(f"🎴 Cycling to card {card_number}")
         self.controller.select_card(card_number)
     
-    def handle_command(self, command):
-        """Execute a command"""
-        action = command.get('action')
+    def _build_dispatch(self):
+        """Build the opcode -> handler table used by handle_opcode()"""
+        handlers = {
+            'cycle_card': self.cycle_card_select,
+            'move_up': self._ends_cycle(self.controller.move_up),
+            'move_down': self._ends_cycle(self.controller.move_down),
+            'move_left': self._ends_cycle(self.controller.move_left),
+            'move_right': self._ends_cycle(self.controller.move_right),
+            'place_card': self._ends_cycle(self.controller.place_card),
+            'reset': self._ends_cycle(self.controller.reset),
+            'exit': self._stop,
+        }
         
-        if action == 'select_card':
-            card = command.get('card', 1)
-            self.controller.select_card(card)
-            self.last_action_was_card_select = False
-        elif action == 'cycle_card':
-            self.cycle_card_select()
-        elif action == 'move_up':
-            self.controller.move_up()
-            self.last_action_was_card_select = False
-        elif action == 'move_down':
-            self.controller.move_down()
-            self.last_action_was_card_select = False
-        elif action == 'move_left':
-            self.controller.move_left()
-            self.last_action_was_card_select = False
-        elif action == 'move_right':
-            self.controller.move_right()
-            self.last_action_was_card_select = False
-        elif action == 'place_card':
-            self.controller.place_card()
-            self.last_action_was_card_select = False
-        elif action == 'reset':
-            self.controller.reset()
+        dispatch = [lambda opcode=opcode: print(f"⚠️  Unknown opcode: {opcode:#04x}")
+                    for opcode in range(256)]
+        for action, opcode in protocol.OPCODES.items():
+            dispatch[opcode] = handlers[action]
+        for card in range(1, 5):
+            dispatch[protocol.SELECT_CARD_BASE | card] = self._ends_cycle(
+                lambda card=card: self.controller.select_card(card))
+        return dispatch
+    
+    def _ends_cycle(self, action):
+        """Wrap an action so it resets card cycling back to Card 1"""
+        def handler():
+            action()
             self.last_action_was_card_select = False
-        elif action == 'exit':
-            self.running = False
-        else:
-            print(f"⚠️  Unknown action: {action}")
+        return handler
+    
+    def _stop(self):
+        """Stop the server loop"""
+        self.running = False
+    
+    def handle_opcode(self, opcode):
+        """Execute a single opcode byte"""
+        self._dispatch[opcode]()
     
     def run(self):
         """Start the control server"""
@@ -109,35 +131,42 @@ class ControlServer:
         
         try:
             while self.running:
-                # Accept new connections
-                if client_socket is None:
-                    try:
-                        client_socket, addr = self.server_socket.accept()
-                        client_socket.settimeout(0.1)
+                for key, _ in self.selector.select(timeout=None):
+                    if key.data == 'wakeup':
+                        self._wakeup_recv.recv(64)
+                    
+                    elif key.data == 'accept':
+                        # Accept new connections (one audio client at a time)
+                        try:
+                            conn, addr = self.server_socket.accept()
+                        except BlockingIOError:
+                            continue
+                        if client_socket is not None:
+                            conn.close()
+                            continue
+                        client_socket = conn
+                        client_socket.setblocking(False)
+                        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                        self.selector.register(client_socket, selectors.EVENT_READ, data='client')
                         print(f"✓ Audio client connected from {addr}")
-                    except socket.timeout:
-                        pass
-                
-                # Receive commands from client
-                if client_socket:
-                    try:
-                        data = client_socket.recv(1024)
-                        if data:
-                            command = json.loads(data.decode('utf-8'))
-                            self.handle_command(command)
+                    
+                    else:
+                        # Receive commands from client
+                        try:
+                            n = client_socket.recv_into(self._rxview)
+                        except (ConnectionResetError, BrokenPipeError):
+                            n = 0
+                        
+                        if n:
+                            # Each byte is one command
+                            for opcode in self._rxview[:n]:
+                                self.handle_opcode(opcode)
                         else:
                             # Client disconnected
                             print("✗ Audio client disconnected")
+                            self.selector.unregister(client_socket)
                             client_socket.close()
                             client_socket = None
-                    except socket.timeout:
-                        pass
-                    except (ConnectionResetError, BrokenPipeError):
-                        print("✗ Audio client disconnected")
-                        client_socket.close()
-                        client_socket = None
-                    except json.JSONDecodeError:
-                        print("⚠️  Received invalid JSON")
         
         except KeyboardInterrupt:
             pass
@@ -145,7 +174,10 @@ class ControlServer:
         finally:
             if client_socket:
                 client_socket.close()
+            self.selector.close()
             self.server_socket.close()
+            self._wakeup_recv.close()
+            self._wakeup_send.close()
             print("\n\nControl server stopped.")
     
     def on_exit(self):
@@ -154,9 +186,13 @@ class ControlServer:
         if self.controller.mouse_pressed:
             self.controller.reset()
         self.running = False
+        self._wakeup_send.send(b'\0')
 
 
 if __name__ == "__main__":
+    # Mouse controller state changes at INFO; per-move details are DEBUG
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     try:
         server = ControlServer()
         server.run()
@@ -1,7 +1,12 @@
+import logging
+import threading
 import time
 from enum import Enum
+import numpy as np
 from virtual_mouse import VirtualMouse
 
+log = logging.getLogger(__name__)
+
 
 class State(Enum):
     IDLE = "idle"  # No card selected
@@ -16,16 +21,20 @@ class MouseController:
         # Card 2 is at (1507, 1588) - offset: (+203, -5)
         # Card 3 is at (1689, 1586) - offset: (+385, -7)
         # Card 4 is at (1869, 1583) - offset: (+565, -10)
-        self.CARD_OFFSETS = {
-            1: (0, 0),       # Card 1 - reference point
-            2: (103, 0),    # Card 2 - relative to Card 1
-            3: (180, 0),    # Card 3 - relative to Card 1
-            4: (270, 0)    # Card 4 - relative to Card 1
-        }
+        # Indexed by card_number - 1; Card 1 is the reference point
+        self.CARD_OFFSET_X = np.array([0, 103, 180, 270], dtype=np.int16)
+        self.CARD_OFFSET_Y = np.zeros(4, dtype=np.int16)
         
         # Movement step size
         self.MOVE_STEP = 50
         
+        # Moves queued within this window are sent as one mouse move
+        self.MOVE_DEBOUNCE = 0.05
+        self._pending_dx = 0
+        self._pending_dy = 0
+        self._flush_timer = None
+        self._move_lock = threading.Lock()
+        
         # State tracking
         self.state = State.IDLE
         self.current_card = None
@@ -38,27 +47,68 @@ class MouseController:
         
         # Create virtual mouse device
         self.mouse = VirtualMouse()
-        print("Virtual mouse ready!")
+        log.info("Virtual mouse ready!")
+    
+    def _queue_move(self, dx, dy):
+        """Add to the pending move and (re)start the debounce timer"""
+        with self._move_lock:
+            self._pending_dx += dx
+            self._pending_dy += dy
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(self.MOVE_DEBOUNCE, self._flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _flush(self):
+        """Send all pending movement as a single mouse move"""
+        with self._move_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            dx, dy = self._pending_dx, self._pending_dy
+            self._pending_dx = 0
+            self._pending_dy = 0
+            if dx == 0 and dy == 0:
+                return
+            
+            self.mouse.move(dx, dy)
+            time.sleep(0.1)
+            self.relative_x += dx
+            self.relative_y += dy
+        log.debug("  - Moved to relative position (%s, %s)", self.relative_x, self.relative_y)
+    
+    def _discard_pending(self):
+        """Drop any pending movement that hasn't been sent yet"""
+        with self._move_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._pending_dx = 0
+            self._pending_dy = 0
         
     def place_card(self):
         """Place the card at current position and return to Card 1"""
         if self.state == State.IDLE:
-            print("No card to place")
+            log.info("No card to place")
             return
         
-        print("Placing card...")
+        log.info("Placing card...")
+        
+        # Finish any queued movement so the card lands where it was dragged
+        self._flush()
         
         # Release mouse if pressed
         if self.mouse_pressed:
             self.mouse.mouse_up()
             self.mouse_pressed = False
-            print("  - Released mouse button")
+            log.debug("  - Released mouse button")
         
         # Wait a moment for the card to register
         time.sleep(0.1)
         
         # Move back to Card 1 (reference position)
-        print(f"  - Returning to Card 1 from ({self.relative_x}, {self.relative_y})")
+        log.debug("  - Returning to Card 1 from (%s, %s)", self.relative_x, self.relative_y)
         self.mouse.move(-self.relative_x, -self.relative_y)
         self.relative_x = 0
         self.relative_y = 0
@@ -66,11 +116,12 @@ class MouseController:
         # Reset state
         self.state = State.IDLE
         self.current_card = None
-        print("  - Returned to Card 1, ready for next card")
+        log.debug("  - Returned to Card 1, ready for next card")
     
     def reset(self):
         """Cancel placement and return to bottom-right corner then back to Card 1"""
-        print("Resetting (canceling)...")
+        log.info("Resetting (canceling)...")
+        self._discard_pending()
         
         # if self.mouse_pressed:
             # Move way down (positive Y) and way left (positive X) to get card off screen
@@ -81,8 +132,8 @@ class MouseController:
         if self.mouse_pressed:
             self.mouse.mouse_up()
             self.mouse_pressed = False
-            print("  - Released mouse button")
-        print("  - Moved to bottom-left and released")
+            log.debug("  - Released mouse button")
+        log.debug("  - Moved to bottom-left and released")
         
         # Move back to Card 1 reference position
         # Move left (negative X) and up (negative Y) to approximate Card 1
@@ -95,15 +146,15 @@ class MouseController:
         self.mouse_pressed = False
         self.relative_x = 0
         self.relative_y = 0
-        print("  - State reset to IDLE, back at Card 1---")
+        log.debug("  - State reset to IDLE, back at Card 1---")
         
     def select_card(self, card_number):
         """Select a card (1-4) from the deck"""
-        if card_number not in [1, 2, 3, 4]:
-            print(f"Invalid card number: {card_number}")
+        if not 0 <= card_number - 1 < len(self.CARD_OFFSET_X):
+            log.warning("Invalid card number: %s", card_number)
             return
         
-        print(f"Selecting card {card_number}")
+        log.info("Selecting card %s", card_number)
         
         
         # First reset if needed
@@ -119,11 +170,12 @@ class MouseController:
         if self.mouse_pressed:
             self.mouse.mouse_up()
             self.mouse_pressed = False
-            print("  - Released mouse button")
+            log.debug("  - Released mouse button")
         
         
         # Move to card position (relative to Card 1)
-        offset_x, offset_y = self.CARD_OFFSETS[card_number]
+        offset_x = int(self.CARD_OFFSET_X[card_number - 1])
+        offset_y = int(self.CARD_OFFSET_Y[card_number - 1])
         
         # If we're not at Card 1, first go back to Card 1
         if self.relative_x != 0 or self.relative_y != 0:
@@ -142,12 +194,12 @@ class MouseController:
         # Update state
         self.state = State.CARD_SELECTED
         self.current_card = card_number
-        print(f"  - Card {card_number} selected at relative position ({self.relative_x}, {self.relative_y})")
+        log.debug("  - Card %s selected at relative position (%s, %s)", card_number, self.relative_x, self.relative_y)
         
     def move_up(self):
         """Move mouse up (or start dragging up if card selected)"""
         if self.state == State.IDLE:
-            print("No card selected, move_up does nothing")
+            log.info("No card selected, move_up does nothing")
             return
         
         if self.state == State.CARD_SELECTED:
@@ -155,18 +207,15 @@ class MouseController:
             self.mouse.mouse_down()
             self.mouse_pressed = True
             self.state = State.PLACING
-            print("Mouse pressed down, entering PLACING state")
+            log.info("Mouse pressed down, entering PLACING state")
         
-        # Move up relatively
-        self.mouse.move(0, -self.MOVE_STEP)
-        time.sleep(0.1)
-        self.relative_y -= self.MOVE_STEP
-        print(f"  - Moved to relative position ({self.relative_x}, {self.relative_y})")
+        # Move up relatively (coalesced with other moves in quick succession)
+        self._queue_move(0, -self.MOVE_STEP)
         
     def move_down(self):
         """Move mouse down (or start dragging down if card selected)"""
         if self.state == State.IDLE:
-            print("No card selected, move_down does nothing")
+            log.info("No card selected, move_down does nothing")
             return
         
         if self.state == State.CARD_SELECTED:
@@ -174,18 +223,15 @@ class MouseController:
             self.mouse.mouse_down()
             self.mouse_pressed = True
             self.state = State.PLACING
-            print("Mouse pressed down, entering PLACING state")
+            log.info("Mouse pressed down, entering PLACING state")
         
-        # Move down relatively
-        self.mouse.move(0, self.MOVE_STEP)
-        time.sleep(0.1)
-        self.relative_y += self.MOVE_STEP
-        print(f"  - Moved to relative position ({self.relative_x}, {self.relative_y})")
+        # Move down relatively (coalesced with other moves in quick succession)
+        self._queue_move(0, self.MOVE_STEP)
         
     def move_left(self):
         """Move mouse left (or start dragging left if card selected)"""
         if self.state == State.IDLE:
-            print("No card selected, move_left does nothing")
+            log.info("No card selected, move_left does nothing")
             return
         
         if self.state == State.CARD_SELECTED:
@@ -193,18 +239,15 @@ class MouseController:
             self.mouse.mouse_down()
             self.mouse_pressed = True
             self.state = State.PLACING
-            print("Mouse pressed down, entering PLACING state")
+            log.info("Mouse pressed down, entering PLACING state")
         
-        # Move left relatively
-        self.mouse.move(-self.MOVE_STEP, 0)
-        time.sleep(0.1)
-        self.relative_x -= self.MOVE_STEP
-        print(f"  - Moved to relative position ({self.relative_x}, {self.relative_y})")
+        # Move left relatively (coalesced with other moves in quick succession)
+        self._queue_move(-self.MOVE_STEP, 0)
         
     def move_right(self):
         """Move mouse right (or start dragging right if card selected)"""
         if self.state == State.IDLE:
-            print("No card selected, move_right does nothing")
+            log.info("No card selected, move_right does nothing")
             return
         
         if self.state == State.CARD_SELECTED:
@@ -212,10 +255,7 @@ class MouseController:
             self.mouse.mouse_down()
             self.mouse_pressed = True
             self.state = State.PLACING
-            print("Mouse pressed down, entering PLACING state")
+            log.info("Mouse pressed down, entering PLACING state")
         
-        # Move right relatively
-        self.mouse.move(self.MOVE_STEP, 0)
-        time.sleep(0.1)
-        self.relative_x += self.MOVE_STEP
-        print(f"  - Moved to relative position ({self.relative_x}, {self.relative_y})")
+        # Move right relatively (coalesced with other moves in quick succession)
+        self._queue_move(self.MOVE_STEP, 0)
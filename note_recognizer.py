@@ -3,11 +3,63 @@ Note Recognition System for Clash Royale Controller
 Recognizes recorder notes from microphone input and triggers actions
 """
 
+import logging
+import math
+import multiprocessing
 import numpy as np
+import os
 import pyaudio
+import queue
+import signal
 import threading
 import time
 from collections import deque
+from scipy.fft import rfft
+
+log = logging.getLogger(__name__)
+
+# Linux-only project (uinput/evdev), so fork: the audio process inherits the
+# configured recognizer without having to pickle its callback
+_mp = multiprocessing.get_context('fork')
+
+
+def _aligned_empty(n, dtype, align=64):
+    """Return an uninitialized 1-D array whose data starts on an `align`-byte boundary"""
+    nbytes = n * np.dtype(dtype).itemsize
+    raw = np.empty(nbytes + align, dtype=np.uint8)
+    offset = -raw.ctypes.data % align
+    return raw[offset:offset + nbytes].view(dtype)
+
+
+def _audio_worker(recognizer, notes, active, parent_pid):
+    """
+    Audio process entry point - captures and analyzes audio, sending each
+    finished note back to the parent through `notes` until `active` is cleared
+    or the parent (`parent_pid`) goes away
+    """
+    # The parent handles Ctrl+C and stops us through `active`
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    # Run on a CPU of our own and at a higher priority if we're allowed to
+    # (raising priority needs CAP_SYS_NICE; without it we just keep going)
+    try:
+        cpus = os.sched_getaffinity(0)
+        if len(cpus) > 1:
+            os.sched_setaffinity(0, {max(cpus)})
+    except OSError:
+        pass
+    try:
+        os.nice(recognizer.AUDIO_PROCESS_NICE)
+    except OSError:
+        pass
+    
+    recognizer.callback = notes.put
+    recognizer._active = active
+    recognizer._parent_pid = parent_pid
+    try:
+        recognizer.process_audio()
+    finally:
+        notes.put(None)  # Lets the parent's drain thread finish
 
 
 class NoteRecognizer:
@@ -23,8 +75,39 @@ class NoteRecognizer:
         
         # Audio settings
         self.SAMPLE_RATE = 44100  # Changed to match working calibration
-        self.CHUNK_SIZE = 4096
-        self.FORMAT = pyaudio.paInt16
+        self.CHUNK_SIZE = 1024  # ~23ms per analysis; 43 Hz bins are finer than any note band
+        self.FORMAT = pyaudio.paFloat32  # PortAudio converts to float32 in C
+        self.VOLUME_THRESHOLD = 200  # Mean |sample| (16-bit scale) below this is silence
+        
+        # Volume gate as a sum over a reused buffer (no temporary, no divide);
+        # float32 samples are in [-1, 1), so rescale the 16-bit threshold
+        self._abs_scratch = _aligned_empty(self.CHUNK_SIZE, np.float32)
+        self._volume_sum_threshold = self.VOLUME_THRESHOLD / 32768 * self.CHUNK_SIZE
+        
+        # Recorder band - FFT peaks outside it are treated as noise
+        self.MIN_FREQUENCY = 500
+        self.MAX_FREQUENCY = 3000
+        
+        # Band limits as FFT bin indices, so the peak check is an int compare
+        self.BIN_HZ = self.SAMPLE_RATE / self.CHUNK_SIZE
+        self._min_bin = math.ceil(self.MIN_FREQUENCY / self.BIN_HZ)
+        self._max_bin = math.floor(self.MAX_FREQUENCY / self.BIN_HZ)
+        
+        # Windowed FFT input, rewritten every chunk (all per-chunk buffers are
+        # cache-line aligned so SIMD loops use aligned loads)
+        self._samples_f32 = _aligned_empty(self.CHUNK_SIZE, np.float32)
+        self._samples_f32.fill(0)
+        
+        # Power spectrum buffers, reused every chunk
+        self._power = _aligned_empty(self.CHUNK_SIZE // 2 + 1, np.float32)
+        self._power_imag = _aligned_empty(self.CHUNK_SIZE // 2 + 1, np.float32)
+        
+        # Hann window against spectral leakage into neighbouring note bands
+        self._window = _aligned_empty(self.CHUNK_SIZE, np.float32)
+        self._window[:] = np.hanning(self.CHUNK_SIZE)
+        
+        # Warm up pocketfft's plan cache so the first audio chunk isn't slower
+        rfft(self._samples_f32, overwrite_x=True)
         
         # Note definitions (frequency ranges in Hz for recorder notes)
         # Calibrated based on your actual recorder
@@ -37,23 +120,39 @@ class NoteRecognizer:
             'A': (800, 881),    # ~861 Hz - Place
         }
         
+        # Whole-Hz -> candidate note lookup built from NOTE_RANGES (None = no
+        # note). A plain list, so indexing never goes through NumPy scalars
+        self._note_bounds = list(self.NOTE_RANGES.items())
+        top = max(high for _, (_, high) in self._note_bounds)
+        self._hz_to_note = [None] * (int(top) + 1)
+        # Fill in reverse so the first range touching each cell wins, as before
+        for note, (low, high) in reversed(self._note_bounds):
+            for hz in range(math.floor(low), math.floor(high) + 1):
+                self._hz_to_note[hz] = (note, low, high)
+        
         # State tracking for debouncing
         self.current_note = None
         self.last_note_time = 0
         self.note_start_time = 0
-        self.MIN_NOTE_DURATION = 0.05   # Minimum 50ms to register a note
-        self.SILENCE_THRESHOLD = 0.1    # 100ms of continuous silence to end a note
-        self.DROPOUT_TOLERANCE = 0.05   # Allow 50ms dropouts without ending the note
+        # Durations are integer nanoseconds on the time.monotonic_ns() clock
+        self.MIN_NOTE_DURATION = 50_000_000    # Minimum 50ms to register a note
+        self.SILENCE_THRESHOLD = 100_000_000   # 100ms of continuous silence to end a note
+        self.DROPOUT_TOLERANCE = 50_000_000    # Allow 50ms dropouts without ending the note
         self.last_detection_time = 0
         self.last_dropout_time = 0
         
         # Rolling buffer for frequency detection stability
         self.freq_buffer = deque(maxlen=5)  # Last 5 frequency readings for better smoothing
         
-        # PyAudio setup
-        self.audio = pyaudio.PyAudio()
+        # Audio runs in its own process (see start()); PyAudio is created there
+        self.AUDIO_PROCESS_NICE = -10
+        self.audio = None
         self.stream = None
         self.running = False
+        self.process = None
+        
+        # Chunks captured by the PortAudio callback, waiting to be analyzed
+        self._chunks = queue.Queue(maxsize=8)
         
         print("Note recognizer initialized")
         print("Note mappings:")
@@ -65,26 +164,36 @@ class NoteRecognizer:
         Analyze audio data and return dominant frequency using FFT
         """
         # Convert to numpy array
-        audio_array = np.frombuffer(audio_data, dtype=np.int16)
+        audio_array = np.frombuffer(audio_data, dtype=np.float32)
         
-        # Check if signal is loud enough
-        volume = np.abs(audio_array).mean()
-        if volume < 200:  # Lower threshold from 300 to 200 for better detection
+        # Check if signal is loud enough before doing any FFT work
+        if np.abs(audio_array, out=self._abs_scratch).sum() < self._volume_sum_threshold:
             return None
         
-        # Apply FFT
-        fft = np.fft.rfft(audio_array)
-        fft_magnitude = np.abs(fft)
+        # Window into the FFT buffer (one pass), then FFT in place
+        np.multiply(audio_array, self._window, out=self._samples_f32)
+        fft = rfft(self._samples_f32, overwrite_x=True)
         
-        # Find peak frequency
-        peak_index = np.argmax(fft_magnitude)
-        frequency = peak_index * self.SAMPLE_RATE / len(audio_array)
+        # Find peak frequency (argmax of |X|^2 is the same bin as |X|, no sqrt needed)
+        power = self._power
+        np.multiply(fft.real, fft.real, out=power)
+        np.multiply(fft.imag, fft.imag, out=self._power_imag)
+        np.add(power, self._power_imag, out=power)
+        peak_index = int(np.argmax(power))
         
         # Ignore very low frequencies (noise) and frequencies outside recorder range
-        if frequency < 500 or frequency > 3000:
+        if not self._min_bin <= peak_index <= self._max_bin:
             return None
         
-        return frequency
+        # Refine to sub-bin accuracy: fit a parabola through the log power of
+        # the peak and its two neighbours (the band check keeps them in range)
+        alpha = math.log(power[peak_index - 1] + 1e-12)
+        beta = math.log(power[peak_index] + 1e-12)
+        gamma = math.log(power[peak_index + 1] + 1e-12)
+        curvature = alpha - 2 * beta + gamma
+        delta = 0.5 * (alpha - gamma) / curvature if curvature < 0 else 0.0
+        
+        return (peak_index + delta) * self.BIN_HZ
     
     def frequency_to_note(self, frequency):
         """
@@ -93,18 +202,39 @@ class NoteRecognizer:
         if frequency is None:
             return None
         
-        for note, (low, high) in self.NOTE_RANGES.items():
+        hz = int(frequency)
+        if hz < 0 or hz >= len(self._hz_to_note):
+            return None
+        candidate = self._hz_to_note[hz]
+        if candidate is None:
+            return None
+        # The whole-Hz cell can overhang the range (e.g. 790.65 Hz -> cell 790)
+        note, low, high = candidate
+        if low <= frequency <= high:
+            return note
+        
+        # Boundary cell shared by fractional bounds - fall back to the scan
+        for note, (low, high) in self._note_bounds:
             if low <= frequency <= high:
                 return note
         
         return None
     
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PortAudio callback - hand the captured chunk to the processing loop"""
+        try:
+            self._chunks.put_nowait(in_data)
+        except queue.Full:
+            pass  # Analysis is behind; drop this chunk rather than stall capture
+        return (None, pyaudio.paContinue)
+    
     def process_audio(self):
         """
-        Main audio processing loop - runs in background thread
+        Main audio processing loop - runs in the audio process
         """
         print("Using default audio input device...")
         
+        self.audio = pyaudio.PyAudio()
         try:
             # Use default device without specifying index (same as calibrate_notes.py)
             self.stream = self.audio.open(
@@ -112,43 +242,65 @@ class NoteRecognizer:
                 channels=1,
                 rate=self.SAMPLE_RATE,
                 input=True,
-                frames_per_buffer=self.CHUNK_SIZE
+                frames_per_buffer=self.CHUNK_SIZE,
+                stream_callback=self._on_audio
             )
         except Exception as e:
             print(f"ERROR: Could not open audio stream: {e}")
             print("Note recognition disabled. Keyboard controls still work.")
-            self.running = False
+            self.audio.terminate()
             return
         
         print("🎤 Microphone active - play notes on your recorder!")
         
-        while self.running:
+        # Bind everything the loop touches per chunk to locals
+        next_chunk = self._chunks.get
+        get_frequency = self.get_frequency
+        frequency_to_note = self.frequency_to_note
+        freq_buffer = self.freq_buffer
+        callback = self.callback
+        min_duration = self.MIN_NOTE_DURATION
+        silence_threshold = self.SILENCE_THRESHOLD
+        dropout_tolerance = self.DROPOUT_TOLERANCE
+        now = time.monotonic_ns
+        getppid = os.getppid
+        parent_pid = self._parent_pid
+        
+        while self._active.is_set():
+            # A killed parent never clears _active; once we've been reparented
+            # stop, so the mic and the raised priority aren't held forever
+            if getppid() != parent_pid:
+                break
             try:
-                # Read audio data
-                audio_data = self.stream.read(self.CHUNK_SIZE, exception_on_overflow=False)
+                # Wait for the next captured chunk
+                try:
+                    audio_data = next_chunk(timeout=0.5)
+                except queue.Empty:
+                    continue
                 
                 # Get frequency
-                frequency = self.get_frequency(audio_data)
+                frequency = get_frequency(audio_data)
                 # print(frequency)
                 
                 # Add to buffer for stability
-                self.freq_buffer.append(frequency)
+                freq_buffer.append(frequency)
                 
-                # Get most common frequency from buffer (mode)
+                # Get stable frequency (median of recent readings)
                 if frequency is not None:
-                    # Get stable frequency (majority vote)
-                    non_none = [f for f in self.freq_buffer if f is not None]
-                    if len(non_none) >= 2:
-                        stable_frequency = np.median(non_none)
+                    # At most 5 values - sorting them beats a NumPy round-trip
+                    recent = sorted(f for f in freq_buffer if f is not None)
+                    mid = len(recent) // 2
+                    if len(recent) % 2:
+                        stable_frequency = recent[mid]
                     else:
-                        stable_frequency = frequency
+                        stable_frequency = (recent[mid - 1] + recent[mid]) / 2
                 else:
                     stable_frequency = None
                 
                 # Convert to note
-                detected_note = self.frequency_to_note(stable_frequency)
+                detected_note = frequency_to_note(stable_frequency)
                 
-                current_time = time.time()
+                current_time = now()
                 
                 if detected_note:
                     self.last_detection_time = current_time
@@ -157,46 +309,68 @@ class NoteRecognizer:
                         # New note starting
                         self.current_note = detected_note
                         self.note_start_time = current_time
-                        print(f"🎵 Note detected: {detected_note} ({stable_frequency:.1f} Hz)")
+                        log.debug("🎵 Note detected: %s (%.1f Hz)", detected_note, stable_frequency)
                     
                     elif detected_note != self.current_note:
                         # Different note - finish previous note and start new one
                         note_duration = current_time - self.note_start_time
-                        if note_duration >= self.MIN_NOTE_DURATION:
-                            print(f"✓ Note played: {self.current_note} (duration: {note_duration:.2f}s)")
-                            self.callback(self.current_note)
+                        if note_duration >= min_duration:
+                            log.info("✓ Note played: %s (duration: %.2fs)", self.current_note, note_duration / 1e9)
+                            callback(self.current_note)
                         
                         self.current_note = detected_note
                         self.note_start_time = current_time
-                        print(f"🎵 Note detected: {detected_note} ({stable_frequency:.1f} Hz)")
+                        log.debug("🎵 Note detected: %s (%.1f Hz)", detected_note, stable_frequency)
                 
                 else:
                     # No note detected (silence or dropout)
                     if self.current_note is not None:
-                        current_time = time.time()
                         silence_duration = current_time - self.last_detection_time
                         
                         # Only end note if silence is longer than dropout tolerance
-                        if silence_duration >= self.DROPOUT_TOLERANCE:
+                        if silence_duration >= dropout_tolerance:
                             # Check if this is real silence (beyond silence threshold)
-                            if silence_duration >= self.SILENCE_THRESHOLD:
+                            if silence_duration >= silence_threshold:
                                 # Note finished
                                 note_duration = self.last_detection_time - self.note_start_time
-                                if note_duration >= self.MIN_NOTE_DURATION:
-                                    print(f"✓ Note played: {self.current_note} (duration: {note_duration:.2f}s)")
-                                    self.callback(self.current_note)
+                                if note_duration >= min_duration:
+                                    log.info("✓ Note played: %s (duration: %.2fs)", self.current_note, note_duration / 1e9)
+                                    callback(self.current_note)
                                 
                                 self.current_note = None
                 
             except Exception as e:
-                print(f"Audio processing error: {e}")
+                log.warning("Audio processing error: %s", e)
                 time.sleep(0.01)
+        
+        self.stream.stop_stream()
+        self.stream.close()
+        self.audio.terminate()
+    
+    def _drain_notes(self):
+        """Deliver notes from the audio process to the callback - runs in background thread"""
+        while True:
+            note = self._notes.get()
+            if note is None:
+                break
+            self.callback(note)
     
     def start(self):
         """Start listening to microphone"""
         if not self.running:
             self.running = True
-            self.thread = threading.Thread(target=self.process_audio, daemon=True)
+            self._active = _mp.Event()
+            self._active.set()
+            self._notes = _mp.SimpleQueue()
+            
+            # Capture and analysis get their own process, away from the
+            # main process's GIL and garbage collector
+            self.process = _mp.Process(target=_audio_worker,
+                                       args=(self, self._notes, self._active, os.getpid()),
+                                       daemon=True)
+            self.process.start()
+            
+            self.thread = threading.Thread(target=self._drain_notes, daemon=True)
             self.thread.start()
             print("Note recognition started")
     
@@ -204,20 +378,21 @@ class NoteRecognizer:
         """Stop listening to microphone"""
         if self.running:
             self.running = False
-            if self.stream:
-                self.stream.stop_stream()
-                self.stream.close()
+            self._active.clear()
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
             print("Note recognition stopped")
     
     def __del__(self):
         """Cleanup"""
         self.stop()
-        if hasattr(self, 'audio'):
-            self.audio.terminate()
 
 
 if __name__ == "__main__":
     """Test the note recognizer"""
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+    
     def on_note_detected(note):
         print(f">>> ACTION TRIGGERED: {note}")
     
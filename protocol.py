@@ -0,0 +1,26 @@
+"""
+Control Protocol - Wire format shared by the audio client and control server
+Every command is a single opcode byte, so no serialization is needed
+"""
+
+# Action name -> opcode byte
+OPCODES = {
+    'cycle_card': 1,
+    'move_up': 2,
+    'move_down': 3,
+    'move_left': 4,
+    'move_right': 5,
+    'place_card': 6,
+    'reset': 7,
+    'exit': 0xFF,
+}
+
+# select_card carries the card number in the low bits (0x11 - 0x14)
+SELECT_CARD_BASE = 0x10
+
+
+def encode(action, card=1):
+    """Return the opcode byte for an action"""
+    if action == 'select_card':
+        return SELECT_CARD_BASE | card
+    return OPCODES[action]
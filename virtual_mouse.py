@@ -16,11 +16,24 @@ class VirtualMouse:
             ecodes.EV_KEY: (ecodes.BTN_LEFT, ecodes.BTN_RIGHT, ecodes.BTN_MIDDLE),  # Mouse buttons
         }
         
+        # Moves up to this size are sent as one event; larger ones are
+        # split into a few waypoints so they still read as a drag
+        self.SINGLE_EVENT_MAX = 50
+        self.MAX_WAYPOINTS = 4
+        
         try:
             self.ui = UInput(cap, name='clash-virtual-mouse', version=0x3)
             print("✓ Virtual mouse device created successfully!")
             print(f"  Device: {self.ui.device.path}")
             time.sleep(0.1)  # Give the system time to register the device
+            
+            # Pre-bound for the event-emitting methods below
+            self._write = self.ui.write
+            self._syn = self.ui.syn
+            self._EV_REL = ecodes.EV_REL
+            self._REL_X = ecodes.REL_X
+            self._REL_Y = ecodes.REL_Y
+            self._EV_KEY = ecodes.EV_KEY
         except Exception as e:
             print(f"✗ Failed to create virtual mouse: {e}")
             print("\nTroubleshooting:")
@@ -31,34 +44,36 @@ class VirtualMouse:
     
     def move(self, dx, dy):
         """Move mouse relatively by (dx, dy) pixels"""
-        # Break large movements into smaller chunks for smoother motion
-        steps = max(abs(dx), abs(dy)) // 10 + 1
+        write, syn = self._write, self._syn
+        ev_rel, rel_x, rel_y = self._EV_REL, self._REL_X, self._REL_Y
+        steps = 1 if max(abs(dx), abs(dy)) <= self.SINGLE_EVENT_MAX else self.MAX_WAYPOINTS
         
         for i in range(steps):
             step_dx = dx // steps if i < steps - 1 else dx - (dx // steps) * (steps - 1)
             step_dy = dy // steps if i < steps - 1 else dy - (dy // steps) * (steps - 1)
             
             if step_dx != 0:
-                self.ui.write(ecodes.EV_REL, ecodes.REL_X, step_dx)
+                write(ev_rel, rel_x, step_dx)
             if step_dy != 0:
-                self.ui.write(ecodes.EV_REL, ecodes.REL_Y, step_dy)
+                write(ev_rel, rel_y, step_dy)
             
-            self.ui.syn()
-            time.sleep(0.001)  # Small delay for smooth movement
+            syn()
+            if i < steps - 1:
+                time.sleep(0.002)  # Small delay between waypoints
     
     def mouse_down(self, button=None):
         """Press mouse button down"""
         if button is None:
             button = ecodes.BTN_LEFT
-        self.ui.write(ecodes.EV_KEY, button, 1)
-        self.ui.syn()
+        self._write(self._EV_KEY, button, 1)
+        self._syn()
     
     def mouse_up(self, button=None):
         """Release mouse button"""
         if button is None:
             button = ecodes.BTN_LEFT
-        self.ui.write(ecodes.EV_KEY, button, 0)
-        self.ui.syn()
+        self._write(self._EV_KEY, button, 0)
+        self._syn()
     
     def click(self, button=None):
         """Perform a complete click"""